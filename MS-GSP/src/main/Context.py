@@ -6,20 +6,27 @@ Created on Feb 5, 2011
 '''
 
 import logging
+import math
 import re
 import sys
 
 # Structure for easier passing around of "global" parameters
 class Context:
     # Constructor
-    def __init__(self, dataPath, paramPath):
+    # If rawSeqDB is given, it is used in place of loading the sequence database from dataPath
+    # Note: its transactions are sorted in place by MIS, so callers sharing a database should pass a copy
+    def __init__(self, dataPath, paramPath, rawSeqDB=None):
         logging.getLogger("Context").info("Creating new context")
         self.rawSeqDB = []             # The sequence database
         self.misMap = {}               # A map of form item id -> minimum item support
         self.supportMap = {}           # A map of form item id -> actual support
-        self.sdc = sys.float_info.max  # The maximum support difference constraint allowed between two sequences      
-        
-        loadData( self.rawSeqDB, dataPath )
+        self.sdc = sys.float_info.max  # The maximum support difference constraint allowed between two sequences
+        self.sdcPartnerIndex = None    # Index of items satisfying the sdc with each other, built once supportMap is known
+
+        if ( rawSeqDB is None ):
+            loadData( self.rawSeqDB, dataPath )
+        else:
+            self.rawSeqDB = rawSeqDB
         logging.getLogger("Context").info("Loaded seqDB: " + str(self.rawSeqDB))
         
         self.sdc = loadParams( self.misMap, paramPath)
@@ -28,6 +35,37 @@ class Context:
         sortData(self.rawSeqDB, self.misMap)
         logging.getLogger("Context").info("Sorted seqDB: " + str(self.rawSeqDB))
 
+# Structure for looking up which items satisfy the support difference constraint with a given item
+# Items are sorted by support, so the partners of each item form a contiguous range which is computed once
+class SdcPartnerIndex:
+    # Constructor
+    def __init__(self, supportMap, sdc):
+        self.itemsBySupport = sorted( supportMap.keys(), key=lambda itemId : ( supportMap[ itemId ], itemId ) )
+        self.rankMap = {}          # A map of form item id -> index within itemsBySupport
+        self.partnerRangeMap = {}  # A map of form item id -> (first, last+1) indices of its partners within itemsBySupport
+        idxLo = 0
+        idxHi = 0
+        for idx, itemId in enumerate( self.itemsBySupport ):
+            self.rankMap[ itemId ] = idx
+            support = supportMap[ itemId ]
+            # Both range bounds only move forward as supports increase
+            while ( math.fabs( support - supportMap[ self.itemsBySupport[ idxLo ] ] ) > sdc ):
+                idxLo += 1
+            idxHi = max( idxHi, idx + 1 )
+            while ( ( idxHi < len( self.itemsBySupport ) ) and ( math.fabs( supportMap[ self.itemsBySupport[ idxHi ] ] - support ) <= sdc ) ):
+                idxHi += 1
+            self.partnerRangeMap[ itemId ] = ( idxLo, idxHi )
+
+    # Returns True if the supports of the two parameter items differ by at most the sdc, False otherwise
+    def isPartner(self, itemId1, itemId2):
+        idxLo, idxHi = self.partnerRangeMap[ itemId1 ]
+        return ( idxLo <= self.rankMap[ itemId2 ] < idxHi )
+
+    # Returns list of all items (including itself) whose supports differ from parameter item's by at most the sdc
+    def getPartners(self, itemId):
+        idxLo, idxHi = self.partnerRangeMap[ itemId ]
+        return self.itemsBySupport[ idxLo:idxHi ]
+
 # Loads data file into a database of sequences, where each sequence is a series list of transactions
 def loadData( rawSeqDB, fileName ):
     FILE = open( fileName, "r" )
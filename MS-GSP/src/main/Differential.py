@@ -0,0 +1,107 @@
+'''
+Created on Oct 19, 2026
+'''
+
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from main.Context import Context
+from main.main import MSGSPMain
+from main.ReferenceMiner import mineReference, seqObjHistToKeyCountHist
+
+# Returns a random raw sequence with parameter total number of items, with distinct items within each transaction
+def generateRawSeq( seqLength, numItems, maxTransLength, rng ):
+    rawSeq = []
+    while seqLength > 0:
+        transLength = rng.randint( 1, min( seqLength, maxTransLength, numItems ) )
+        seqLength -= transLength
+        rawSeq.append( rng.sample( range( 1, numItems+1 ), transLength ) )
+    return rawSeq
+
+# Writes a random sequence database and matching parameter file to the parameter paths
+# Each data sequence is random noise with each of numPlantedSeqs fixed sequences of plantedSeqLength items inserted
+# with probability plantProb, so supports of the planted sequences (and their sub-sequences) do not depend on numSeqs
+def generateInputs( dataPath, paramPath, numSeqs, numItems, maxSeqLength, maxTransLength, rng, numPlantedSeqs=4, plantedSeqLength=4, plantProb=0.3 ):
+    plantedRawSeqs = [ generateRawSeq( plantedSeqLength, numItems, maxTransLength, rng ) for idxPlanted in range( numPlantedSeqs ) ]
+
+    dataFile = open( dataPath, 'w' )
+    for idxSeq in range( numSeqs ):
+        rawSeq = generateRawSeq( rng.randint( 1, maxSeqLength ), numItems, maxTransLength, rng )
+        for plantedRawSeq in plantedRawSeqs:
+            if ( rng.random() < plantProb ):
+                # Insert the planted transactions, in order, at random positions between the existing ones
+                idxsPlanted = sorted( rng.sample( range( len( rawSeq ) + len( plantedRawSeq ) ), len( plantedRawSeq ) ) )
+                noiseTransactions = iter( rawSeq )
+                plantedTransactions = iter( plantedRawSeq )
+                rawSeq = [ next( plantedTransactions ) if ( idx in idxsPlanted ) else next( noiseTransactions ) for idx in range( len( rawSeq ) + len( plantedRawSeq ) ) ]
+        dataFile.write( "<" + "".join( "{" + ", ".join( str( item ) for item in trans ) + "}" for trans in rawSeq ) + ">\n" )
+    dataFile.close()
+
+    paramFile = open( paramPath, 'w' )
+    for item in range( 1, numItems+1 ):
+        paramFile.write( "MIS(" + str( item ) + ") = " + ( "%.4f" % rng.uniform( 0.05, 0.25 ) ) + "\n" )
+    paramFile.write( "SDC = " + ( "%.4f" % rng.uniform( 0.05, 0.5 ) ) + "\n" )
+    paramFile.close()
+
+# Returns counts of missing, incorrect and miscounted sequences in FHist relative to the reference history
+def compareToReference( FHistRef, FHist ):
+    countMissing = 0
+    countIncorrect = 0
+    countMiscounted = 0
+    for k in range( len( FHistRef ) ):
+        F = FHist[ k ] if ( k < len( FHist ) ) else {}
+        for key, count in FHistRef[ k ].items():
+            if key not in F:
+                countMissing += 1
+            elif ( F[ key ] != count ):
+                countMiscounted += 1
+        for key in F:
+            if key not in FHistRef[ k ]:
+                countIncorrect += 1
+    return ( countMissing, countIncorrect, countMiscounted )
+
+# Runs every engine against the reference miner on generated datasets of increasing number of sequences
+# engines is a map of form name -> function( maxK, dataPath, paramPath ) returning a history of frequent sequence objects
+# Generated datasets contain planted sequences of maxK+1 items, so every size has frequent sequences up to length maxK
+# Returns a list of reports, one per (number of sequences, engine) pair
+def runDifferential( lstNumSeqs, engines=None, maxK=4, numItems=30, maxSeqLength=10, maxTransLength=3, seed=0 ):
+    if ( engines is None ):
+        engines = { "MSGSPMain" : MSGSPMain }
+    rng = random.Random( seed )
+    workDir = tempfile.mkdtemp()
+    reports = []
+    try:
+        for numSeqs in lstNumSeqs:
+            dataPath = os.path.join( workDir, "data-" + str( numSeqs ) + ".txt" )
+            paramPath = os.path.join( workDir, "para-" + str( numSeqs ) + ".txt" )
+            generateInputs( dataPath, paramPath, numSeqs, numItems, maxSeqLength, maxTransLength, rng, plantedSeqLength=maxK+1 )
+
+            startTime = time.time()
+            FHistRef = mineReference( Context( dataPath, paramPath ), maxK )
+            refTime = time.time() - startTime
+            refLevelSizes = [ len( F ) for F in FHistRef ]
+            logging.getLogger("Differential").info(str(numSeqs) + " sequences: reference found " + str(refLevelSizes) + " k-sequences in " + ("%.3f" % refTime) + " s")
+
+            for name in sorted( engines.keys() ):
+                startTime = time.time()
+                FHist = seqObjHistToKeyCountHist( engines[ name ]( maxK, dataPath, paramPath ) )
+                engineTime = time.time() - startTime
+                countMissing, countIncorrect, countMiscounted = compareToReference( FHistRef, FHist )
+                logging.getLogger("Differential").info(str(numSeqs) + " sequences: " + name + ": " + str(countMissing) + " missing, " + str(countIncorrect) + " incorrect, " + str(countMiscounted) + " miscounted in " + ("%.3f" % engineTime) + " s")
+                reports.append( { "numSeqs" : numSeqs, "engine" : name, "time" : engineTime, "refTime" : refTime, "refLevelSizes" : refLevelSizes,
+                                  "missing" : countMissing, "incorrect" : countIncorrect, "miscounted" : countMiscounted } )
+    finally:
+        shutil.rmtree( workDir )
+    return reports
+
+#### Application entry point
+
+# Run from the source directory with: python -m main.Differential
+if __name__ == '__main__':
+    for report in runDifferential( [ 100, 1000, 10000 ] ):
+        print( report[ "numSeqs" ], "sequences:", report[ "engine" ], ":", report[ "missing" ], "missing,", report[ "incorrect" ], "incorrect,",
+               report[ "miscounted" ], "miscounted in", "%.3f" % report[ "time" ], "s (reference:", report[ "refLevelSizes" ], "k-sequences in", "%.3f" % report[ "refTime" ], "s)" )
@@ -0,0 +1,191 @@
+'''
+Created on Oct 19, 2026
+'''
+
+import collections
+import logging
+import multiprocessing
+import multiprocessing.connection
+import sys
+
+try:
+    import resource # Used for per-job memory limits, only available on Unix
+except ImportError:
+    resource = None
+
+from main.Context import Context, loadData
+from main.main import MSGSPMain, OUTPUT_MODE_ALL, initLogger, printFreqSeqObjs
+
+# Structure describing a single MS-GSP job
+class Job:
+    # Constructor
+    def __init__( self, dataPath, paramPath, maxK=10, outputMode=None, memLimit=None, name=None ):
+        self.dataPath = dataPath      # The path to the input data
+        self.paramPath = paramPath    # The path to the MIS parameter data
+        self.maxK = maxK              # The maximum length of sequences to mine
+        self.outputMode = outputMode  # One of the OUTPUT_MODE_* values accepted by MSGSPMain
+        self.memLimit = memLimit      # Maximum address space in bytes for the process running this job, None for no limit
+        self.name = name              # Label used when reporting progress, defaults to the data and parameter paths
+        if ( self.outputMode is None ):
+            self.outputMode = OUTPUT_MODE_ALL
+        if ( self.name is None ):
+            self.name = dataPath + " " + paramPath
+
+    # String representation
+    def __repr__(self):
+        return "Job(" + self.name + ")"
+
+# Structure holding the outcome of a single MS-GSP job
+class JobResult:
+    # Constructor
+    def __init__( self, job, FHist=None, error=None ):
+        self.job = job      # The job which was run
+        self.FHist = FHist  # History of frequent sequences, None if the job failed
+        self.error = error  # Description of why the job failed, None if it succeeded
+
+    # Returns True if the job finished without error, False otherwise
+    def succeeded(self):
+        return ( self.error is None )
+
+#### Worker process utilities
+
+# Limits the address space of the current process to parameter number of bytes
+def setMemLimit( memLimit ):
+    if ( ( memLimit is None ) or ( resource is None ) ):
+        return
+    softLimit, hardLimit = resource.getrlimit( resource.RLIMIT_AS )
+    if ( hardLimit != resource.RLIM_INFINITY ):
+        memLimit = min( memLimit, hardLimit )
+    resource.setrlimit( resource.RLIMIT_AS, ( memLimit, hardLimit ) )
+
+# Runs parameter job on parameter sequence database and returns its result
+# Note: rawSeqDB is sorted in place, so it must not be shared with other jobs
+def runJob( job, rawSeqDB ):
+    try:
+        ctx = Context( job.dataPath, job.paramPath, rawSeqDB )
+        FHist = MSGSPMain( job.maxK, job.dataPath, job.paramPath, job.outputMode, ctx )
+        return JobResult( job, FHist )
+    except MemoryError:
+        return JobResult( job, None, "Memory limit of " + str( job.memLimit ) + " bytes exceeded" )
+    except Exception as e:
+        return JobResult( job, None, repr( e ) )
+
+# Entry point of the worker process for a single job, sends the job result through parameter connection
+def runJobInWorker( conn, job, rawSeqDB ):
+    setMemLimit( job.memLimit )
+    conn.send( runJob( job, rawSeqDB ) )
+    conn.close()
+
+#### Job runner
+
+# Runs all parameter jobs (any iterable of Job objects) with at most numWorkers worker processes at a time (defaults to the number of cores)
+# Yields (index of job within jobs, job result) pairs as each job finishes
+# Each job runs in its own worker process, so a memory limit only applies to its job and a worker which dies
+# (e.g. killed by the OS) is reported as a failed result for its job alone
+# Each distinct data file is parsed once, here; a worker only receives the database for its own job's data file.
+# With the fork start method the database is inherited by the worker without copying until it is sorted,
+# otherwise it is pickled once per job. A data file which cannot be loaded fails only the jobs which use it.
+def iterJobResultsWithIdx( jobs, numWorkers=None ):
+    jobs = list( jobs ) # Iterated more than once below
+    if ( numWorkers is None ):
+        numWorkers = multiprocessing.cpu_count()
+    assert( numWorkers >= 1 )
+
+    # Load each distinct data file once
+    rawSeqDBMap = {}   # A map of form data path -> raw sequence database
+    loadErrorMap = {}  # A map of form data path -> description of why the data file could not be loaded
+    for job in jobs:
+        if ( job.dataPath not in rawSeqDBMap ) and ( job.dataPath not in loadErrorMap ):
+            rawSeqDB = []
+            try:
+                loadData( rawSeqDB, job.dataPath )
+            except Exception as e:
+                loadErrorMap[ job.dataPath ] = repr( e )
+                logging.getLogger("JobRunner").error("Failed to load data file: " + job.dataPath + ": " + repr( e ))
+                continue
+            rawSeqDBMap[ job.dataPath ] = rawSeqDB
+            logging.getLogger("JobRunner").info("Loaded data file: " + job.dataPath)
+
+    pendingJobs = collections.deque()
+    runningJobsMap = {} # A map of form result connection -> (index of job, job, worker process)
+    try:
+        # Jobs whose data file could not be loaded fail without starting a worker
+        for idxJob, job in enumerate( jobs ):
+            if job.dataPath in loadErrorMap:
+                yield ( idxJob, JobResult( job, None, loadErrorMap[ job.dataPath ] ) )
+            else:
+                pendingJobs.append( ( idxJob, job ) )
+        while ( len( pendingJobs ) > 0 ) or ( len( runningJobsMap ) > 0 ):
+            # Start jobs while there are free workers
+            while ( len( pendingJobs ) > 0 ) and ( len( runningJobsMap ) < numWorkers ):
+                idxJob, job = pendingJobs.popleft()
+                recvConn, sendConn = multiprocessing.Pipe( False )
+                process = multiprocessing.Process( target=runJobInWorker, args=( sendConn, job, rawSeqDBMap[ job.dataPath ] ) )
+                process.start()
+                # Close our copy of the sending end so the connection reports EOF if the worker dies
+                sendConn.close()
+                runningJobsMap[ recvConn ] = ( idxJob, job, process )
+            # Collect results of finished (or dead) workers
+            for recvConn in multiprocessing.connection.wait( list( runningJobsMap.keys() ) ):
+                idxJob, job, process = runningJobsMap.pop( recvConn )
+                try:
+                    jobResult = recvConn.recv()
+                except EOFError:
+                    jobResult = None
+                recvConn.close()
+                process.join()
+                if ( jobResult is None ):
+                    jobResult = JobResult( job, None, "Worker process exited with code " + str( process.exitcode ) + " without a result" )
+                yield ( idxJob, jobResult )
+    finally:
+        # Stop any workers left running if the caller stopped iterating early
+        for idxJob, job, process in runningJobsMap.values():
+            process.terminate()
+            process.join()
+
+# Runs all parameter jobs as iterJobResultsWithIdx does, yielding each job result as soon as its job finishes
+def iterJobResults( jobs, numWorkers=None ):
+    for idxJob, jobResult in iterJobResultsWithIdx( jobs, numWorkers ):
+        yield jobResult
+
+# Runs all parameter jobs as iterJobResultsWithIdx does and waits for all of them to finish
+# onProgress( jobResult, numJobsDone, numJobsTotal ) is called with each job result as soon as its job finishes
+# Returns list of job results in the same order as the parameter jobs
+def runJobs( jobs, numWorkers=None, onProgress=None ):
+    jobs = list( jobs )
+    jobResults = [ None ] * len( jobs )
+    numJobsDone = 0
+    for idxJob, jobResult in iterJobResultsWithIdx( jobs, numWorkers ):
+        jobResults[ idxJob ] = jobResult
+        numJobsDone += 1
+        if jobResult.succeeded():
+            logging.getLogger("JobRunner").info("Finished " + str(jobResult.job) + " (" + str(numJobsDone) + "/" + str(len(jobs)) + ")")
+        else:
+            logging.getLogger("JobRunner").error("Failed " + str(jobResult.job) + ": " + jobResult.error)
+        if ( onProgress is not None ):
+            onProgress( jobResult, numJobsDone, len( jobs ) )
+    return jobResults
+
+#### Application entry point
+
+# Runs one job per pair of data and parameter paths given on the command line, printing results as jobs finish
+# Run from the source directory with: python -m main.JobRunner <dataPath> <paramPath> [<dataPath> <paramPath> ...]
+def appMain( args ):
+    # Initialize logging
+    initLogger()
+    if ( ( len( args ) == 0 ) or ( len( args ) % 2 != 0 ) ):
+        print( "Usage: python -m main.JobRunner <dataPath> <paramPath> [<dataPath> <paramPath> ...]" )
+        return 1
+    jobs = [ Job( args[ idx ], args[ idx+1 ], 6 ) for idx in range( 0, len( args ), 2 ) ] # max k-value
+    numJobsFailed = 0
+    for jobResult in iterJobResults( jobs ):
+        print( "==== " + jobResult.job.name + " ====" )
+        if jobResult.succeeded():
+            printFreqSeqObjs( jobResult.FHist )
+        else:
+            numJobsFailed += 1
+            print( "FAILED: " + jobResult.error )
+    return 0 if ( numJobsFailed == 0 ) else 1
+
+if __name__ == '__main__':
+    sys.exit( appMain( sys.argv[1:] ) )
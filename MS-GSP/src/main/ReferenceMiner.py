@@ -0,0 +1,54 @@
+'''
+Created on Oct 19, 2026
+'''
+
+import itertools
+
+from main.Sequence import rawSeqToKey
+
+# Adds keys of all distinct sub-sequences of parameter raw sequence with at most maxK items to subSeqKeys
+# Transactions are assumed to be sorted by MIS, so sub-sequences come out in the same canonical order as MSGSPMain output
+def addSubSeqKeys( subSeqKeys, rawSeq, maxK ):
+    def extend( prefixKey, prefixLength, idxNextTrans ):
+        for idxTrans in range( idxNextTrans, len( rawSeq ) ):
+            trans = rawSeq[ idxTrans ]
+            for transLength in range( 1, min( len( trans ), maxK - prefixLength ) + 1 ):
+                for itemSet in itertools.combinations( trans, transLength ):
+                    subSeqKey = prefixKey + ( itemSet, )
+                    subSeqKeys.add( subSeqKey )
+                    if ( prefixLength + transLength < maxK ):
+                        extend( subSeqKey, prefixLength + transLength, idxTrans + 1 )
+    extend( (), 0, 0 )
+
+# Returns a map of form sub-sequence key -> count for all sub-sequences with at most maxK items occurring in parameter database
+def countAllSubSeqs( rawSeqDB, maxK ):
+    countMap = {}
+    for rawSeq in rawSeqDB:
+        subSeqKeys = set()
+        addSubSeqKeys( subSeqKeys, rawSeq, maxK )
+        for subSeqKey in subSeqKeys:
+            countMap[ subSeqKey ] = countMap.get( subSeqKey, 0 ) + 1
+    return countMap
+
+# Returns reference history of frequent sequences for parameter context
+# Output is a list where entry k-1 is a map of form key -> count of all frequent k-sequences
+# A sequence is frequent if its support is at least the lowest MIS among its items and the supports of its items differ by at most sdc
+def mineReference( ctx, maxK ):
+    countMap = countAllSubSeqs( ctx.rawSeqDB, maxK )
+    numSeqs = float( len( ctx.rawSeqDB ) )
+    itemSupportMap = {}
+    for key, count in countMap.items():
+        if ( len( key ) == 1 ) and ( len( key[0] ) == 1 ):
+            itemSupportMap[ key[0][0] ] = count / numSeqs
+
+    FHist = [ {} for idxK in range( maxK ) ]
+    for key, count in countMap.items():
+        items = [ item for itemSet in key for item in itemSet ]
+        itemSupports = [ itemSupportMap[ item ] for item in items ]
+        if ( ( count / numSeqs >= min( ctx.misMap[ item ] for item in items ) ) and ( max( itemSupports ) - min( itemSupports ) <= ctx.sdc ) ):
+            FHist[ len( items ) - 1 ][ key ] = count
+    return FHist
+
+# Converts a history of frequent sequence objects (as returned by MSGSPMain) into the format returned by mineReference
+def seqObjHistToKeyCountHist( FHist ):
+    return [ dict( ( rawSeqToKey( seqObj.getRawSeq() ), int( seqObj.getCount() ) ) for seqObj in F ) for F in FHist ]
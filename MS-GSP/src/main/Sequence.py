@@ -180,6 +180,10 @@ def rawSeqContains( rawSeqSup, rawSeqSub ):
                 return True
     return False
 
+# Returns a hashable key for the parameter raw sequence (transactions are assumed to be sorted by MIS)
+def rawSeqToKey( rawSeq ):
+    return tuple( tuple( trans ) for trans in rawSeq )
+
 # Returns True if parameter raw sequence is not found within parameter sequence object list, False otherwise
 def isUniqueRawSeqWithinList( lstSeqObjs, rawSeq ):
     for seqObj in lstSeqObjs:
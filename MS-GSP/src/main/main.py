@@ -7,8 +7,12 @@ Created on Jan 26, 2011
 
 import copy
 import logging
-import math
-    
+
+# Output modes for frequent sequences reported by MSGSPMain
+OUTPUT_MODE_ALL = "all"         # Report every frequent sequence
+OUTPUT_MODE_CLOSED = "closed"   # Report only sequences with no frequent super-sequence of equal count
+OUTPUT_MODE_MAXIMAL = "maximal" # Report only sequences with no frequent super-sequence
+
 #### Initialization utilities
 
 # Set up logging
@@ -25,8 +29,9 @@ def initLogger():
 
 
 # Returns True if the support difference between items at parameter indices of two sequences satisfies the sdc, False otherwise
+# Assumes ctx.sdcPartnerIndex has been built by initPass
 def satisfiesSDC( seqObj1, idxItem1, seqObj2, idxItem2, ctx ):
-    return ( math.fabs( seqObj1.getSupportForItemAtIdx( idxItem1, ctx.supportMap ) - seqObj2.getSupportForItemAtIdx( idxItem2, ctx.supportMap ) ) <= ctx.sdc )
+    return ctx.sdcPartnerIndex.isPartner( seqObj1.getItemAtIdx( idxItem1 ), seqObj2.getItemAtIdx( idxItem2 ) )
 
 # Appends the raw sequence as a sequence object and caches the support of the sequence
 # Using this utility function because we can't overload constructors in Python
@@ -39,6 +44,36 @@ def appendSeqObjAndCacheSupport( lstSeqObjs, rawSeq, mis, rawSeqDB ):
 def extractAllSeqObjsWhichSatisfyTheirMis( F, C ):
     F[:] = [ seqObj for seqObj in C if ( seqObj.getSupport() >= seqObj.getMis() ) ]
 
+# Returns a map of form raw sequence key -> highest count among sequences in FNext which contain it as an immediate sub-sequence
+def getMaxSuperSeqCountMap( FNext ):
+    maxSuperSeqCountMap = {}
+    for superSeqObj in FNext:
+        for idxItemToDel in range( superSeqObj.length() ):
+            subKey = rawSeqToKey( superSeqObj.getRawSeqWithoutItemAtIdx( idxItemToDel ) )
+            if ( maxSuperSeqCountMap.get( subKey, -1.0 ) < superSeqObj.getCount() ):
+                maxSuperSeqCountMap[ subKey ] = superSeqObj.getCount()
+    return maxSuperSeqCountMap
+
+# Removes all sequences from F which have an immediate super-sequence in FNext with the same count
+def removeAllSeqObjsWhichAreNotClosed( F, FNext ):
+    maxSuperSeqCountMap = getMaxSuperSeqCountMap( FNext )
+    F[:] = [ seqObj for seqObj in F if ( maxSuperSeqCountMap.get( rawSeqToKey( seqObj.getRawSeq() ), -1.0 ) != seqObj.getCount() ) ]
+
+# Removes all sequences from F which have an immediate super-sequence in FNext
+def removeAllSeqObjsWhichAreNotMaximal( F, FNext ):
+    maxSuperSeqCountMap = getMaxSuperSeqCountMap( FNext )
+    F[:] = [ seqObj for seqObj in F if ( rawSeqToKey( seqObj.getRawSeq() ) not in maxSuperSeqCountMap ) ]
+
+# Filters F according to parameter output mode now that the frequent sequences one level up (FNext) are known
+# Note: F must no longer be needed for candidate generation when this is called
+def filterSeqObjsByOutputMode( F, FNext, outputMode ):
+    if ( outputMode == OUTPUT_MODE_CLOSED ):
+        removeAllSeqObjsWhichAreNotClosed( F, FNext )
+    elif ( outputMode == OUTPUT_MODE_MAXIMAL ):
+        removeAllSeqObjsWhichAreNotMaximal( F, FNext )
+    else:
+        assert( outputMode == OUTPUT_MODE_ALL )
+
 #### GSP Algorithm
 
 # Initial pass for MS-GSP
@@ -70,6 +105,9 @@ def initPass( L, F, ctx ):
         L.append( Sequence( [[key]], ctx.misMap[ key ], count, support ) )
         ctx.supportMap[key] = support # Cache item supports
     
+    # Item supports are now fixed, so determine which items satisfy the sdc with each other once
+    ctx.sdcPartnerIndex = SdcPartnerIndex( ctx.supportMap, ctx.sdc )
+    
     # Sort possible 1-sequences by MIS
     L.sort( key = lambda seqObj : (seqObj.getMis(),seqObj.getFirstItemId()) )
     
@@ -91,6 +129,7 @@ def initPass( L, F, ctx ):
 # Determines candidate 2-sequences
 def level2CandidateGen( C, L, ctx ):
     C[:] = []
+    idxLMap = dict( ( seqObj.getFirstItemId(), idx ) for idx, seqObj in enumerate( L ) ) # A map of form item id -> index within L
     for idxL in range( len(L) ):
         seqObjL = L[ idxL ]
         # Assert we're working with sequences of length 1
@@ -100,13 +139,15 @@ def level2CandidateGen( C, L, ctx ):
             lId = seqObjL.getFirstItemId()
             # Create 2-tuple <{l}{l}> - it could exist!
             appendSeqObjAndCacheSupport( C, [ [ lId ], [ lId ] ], seqObjL.getMis(), ctx.rawSeqDB )
-            # Create 2-tuples with all sequences 'h' where MIS(h) >= MIS(l)  
-            for idxH in range( idxL+1, len(L) ):
+            # Create 2-tuples with all sequences 'h' where MIS(h) >= MIS(l) and the sdc is satisfied
+            # Only sdc partners of 'l' are visited, in order of their position within L
+            idxsH = sorted( idxLMap[ hId ] for hId in ctx.sdcPartnerIndex.getPartners( lId ) if ( idxLMap.get( hId, -1 ) > idxL ) )
+            for idxH in idxsH:
                 seqObjH = L[ idxH ]
                 # Assert sequences were pre-sorted by MIS
                 assert( seqObjH.getMis() >= seqObjL.getMis() )
                 # Only create tuple if sup(h) is greater than MIS(l)
-                if ( ( seqObjH.getSupport() >= seqObjL.getMis() ) and satisfiesSDC( seqObjL, 0, seqObjH, 0, ctx ) ):
+                if ( seqObjH.getSupport() >= seqObjL.getMis() ):
                     # Join seqL and seqH to create both <{l,h}> and <{l,h}>
                     hId = seqObjH.getFirstItemId()
                     assert ( hId != lId ) # assert these items are unique!
@@ -186,12 +227,30 @@ def MSCandidateGenSPM_prune( C, FPrev, misMap ):
 def MSCandidateGenSPM( C, FPrev, ctx ):
     # Join step: create candidate sequences by joining Fk-1 with Fk-1
     # NOTE: seqObj1 joins seqObj2 and seqObj2 joins with seqObj1 iff seqObj1 = <abab...ab> and seqObj2 = <baba..ba>
+    # Every join below requires the sdc between an item of seqObj1 and either the last or (when the last item has unique
+    # min MIS) second to last item of seqObj2, so index Fk-1 by those items and only visit seqObj2 among sdc partners
+    lstSeqObj2_LastItemHasUniqueMinMis = [ seqObj2.lastItemHasUniqueMinMis( ctx.misMap ) for seqObj2 in FPrev ]
+    idxsByLastItemMap = {}         # A map of form item id -> indices within FPrev of sequences ending with that item
+    idxsBySecondToLastItemMap = {} # A map of form item id -> indices within FPrev of sequences with that second to last item and unique min MIS last item
+    for idx, seqObj2 in enumerate( FPrev ):
+        idxsByLastItemMap.setdefault( seqObj2.getLastItemId(), [] ).append( idx )
+        if lstSeqObj2_LastItemHasUniqueMinMis[ idx ]:
+            idxsBySecondToLastItemMap.setdefault( seqObj2.getItemAtIdx( -2 ), [] ).append( idx )
     for seqObj1 in FPrev:
         bSeqObj1_FirstItemHasUniqueMinMis = seqObj1.firstItemHasUniqueMinMis( ctx.misMap )
-        for seqObj2 in FPrev:
+        idxsSeqObj2 = set()
+        for partnerItemId in ctx.sdcPartnerIndex.getPartners( seqObj1.getFirstItemId() ):
+            idxsSeqObj2.update( idxsByLastItemMap.get( partnerItemId, [] ) )
+            idxsSeqObj2.update( idxsBySecondToLastItemMap.get( partnerItemId, [] ) )
+        if bSeqObj1_FirstItemHasUniqueMinMis:
+            for partnerItemId in ctx.sdcPartnerIndex.getPartners( seqObj1.getItemAtIdx( 1 ) ):
+                idxsSeqObj2.update( idxsByLastItemMap.get( partnerItemId, [] ) )
+        # Visit in order of FPrev so candidates are generated in the same order as a full pairwise scan
+        for idxSeqObj2 in sorted( idxsSeqObj2 ):
+            seqObj2 = FPrev[ idxSeqObj2 ]
             if ( bSeqObj1_FirstItemHasUniqueMinMis and (ctx.misMap[seqObj2.getLastItemId()] > ctx.misMap[seqObj1.getFirstItemId()]) ):
                 MSCandidateGenSPM_conditionalJoinWhenFirstItemHasUniqueMinMis( seqObj1, seqObj2, C, ctx )        
-            elif ( seqObj2.lastItemHasUniqueMinMis( ctx.misMap ) and (ctx.misMap[seqObj2.getLastItemId()] < ctx.misMap[seqObj1.getFirstItemId()]) ):
+            elif ( lstSeqObj2_LastItemHasUniqueMinMis[ idxSeqObj2 ] and (ctx.misMap[seqObj2.getLastItemId()] < ctx.misMap[seqObj1.getFirstItemId()]) ):
                 MSCandidateGenSPM_conditionalJoinWhenLastItemHasUniqueMinMis( seqObj1, seqObj2, C, ctx )  
             elif ( seqObj1.canJoin( seqObj2 ) and satisfiesSDC( seqObj1, 0, seqObj2, -1, ctx ) ):
                 appendSeqObjAndCacheSupport( C, seqObj1.join(seqObj2, ctx.misMap), min( seqObj1.getMis(), ctx.misMap[ seqObj2.getLastItemId() ] ), ctx.rawSeqDB )
@@ -206,9 +265,13 @@ def printFreqSeqObjs( FHist ):
         print()
   
 # Main body of MS-GSP
-def MSGSPMain(maxK = 10, dataPath = "../../../Data/data.txt", paramPath="../../../Data/para.txt"):
+# Non-closed or non-maximal sequences (see outputMode) are dropped level by level while mining, as soon as the next level is known
+# If ctx is given, it is used in place of creating a new context from dataPath and paramPath
+def MSGSPMain(maxK = 10, dataPath = "../../../Data/data.txt", paramPath="../../../Data/para.txt", outputMode = OUTPUT_MODE_ALL, ctx = None):
+    assert( outputMode in ( OUTPUT_MODE_ALL, OUTPUT_MODE_CLOSED, OUTPUT_MODE_MAXIMAL ) )
     
-    ctx = Context(dataPath,paramPath)
+    if ( ctx is None ):
+        ctx = Context(dataPath,paramPath)
     
     # Generate all frequent 1-sequences
     CHist = [[]] # used for generating candidate 2-sequences
@@ -225,6 +288,7 @@ def MSGSPMain(maxK = 10, dataPath = "../../../Data/data.txt", paramPath="../../.
     FHist.append([])
     extractAllSeqObjsWhichSatisfyTheirMis( FHist[-1], CHist[-1] )
     logging.getLogger("MSGSPMain").info("Frequent 2-sequences: " + str(FHist[1]))
+    filterSeqObjsByOutputMode( FHist[0], FHist[1], outputMode )
     
     # Generate remaining k-sequences   
     for idxK in range( 2, maxK ):
@@ -237,6 +301,8 @@ def MSGSPMain(maxK = 10, dataPath = "../../../Data/data.txt", paramPath="../../.
         FHist.append([])
         extractAllSeqObjsWhichSatisfyTheirMis( FHist[-1], CHist[-1] )
         logging.getLogger("MSGSPMain").info("Frequent " + str(idxK+1) + "-sequences: " + str(FHist[-1]))
+        # Fk-1 has now been used for candidate generation and may be filtered
+        filterSeqObjsByOutputMode( FHist[-2], FHist[-1], outputMode )
 
     return FHist
 
@@ -255,9 +321,9 @@ def appMain():
         
 if __name__ == '__main__':
     # Imports
-    from Sequence import Sequence,isUniqueRawSeqWithinList
-    from Context import Context
+    from Sequence import Sequence,isUniqueRawSeqWithinList,rawSeqToKey
+    from Context import Context, SdcPartnerIndex
     appMain();
 else:
-    from main.Sequence import Sequence, isUniqueRawSeqWithinList
-    from main.Context import Context
+    from main.Sequence import Sequence, isUniqueRawSeqWithinList, rawSeqToKey
+    from main.Context import Context, SdcPartnerIndex
@@ -6,13 +6,23 @@ Created on Feb 5, 2011
 '''
 
 import copy
+import math
+import multiprocessing
+import os
 import random
+import shutil
+import signal
+import subprocess
 import sys
+import tempfile
 import unittest
+import unittest.mock
 
-from main.Context import Context
+from main.Context import Context, SdcPartnerIndex
 from main.Sequence import rawSeqContains
-from main.main import MSGSPMain
+from main.Differential import generateInputs, runDifferential
+from main.JobRunner import Job, iterJobResults, runJobs
+from main.main import MSGSPMain, OUTPUT_MODE_ALL, OUTPUT_MODE_CLOSED, OUTPUT_MODE_MAXIMAL
 
 class TestMSGSPOutput(unittest.TestCase):
     def generateInputs(self):
@@ -214,5 +224,125 @@ class TestMSGSPOutput(unittest.TestCase):
    
             self.reportDiscrepancies(nextSeqs,FHist,k)
 
+class TestMSGSPOutputModes(unittest.TestCase):
+    def setUp(self):
+        self.maxK=4
+        self.inputs=[("../../../Data/data.txt","../../../Data/para.txt")]
+
+        # Also check generated datasets, where MIS and SDC may leave gaps between levels
+        self.workDir=tempfile.mkdtemp()
+        for seed in range(3):
+            dataPath=os.path.join(self.workDir,"data-"+str(seed)+".txt")
+            paramPath=os.path.join(self.workDir,"para-"+str(seed)+".txt")
+            generateInputs(dataPath,paramPath,100,20,8,3,random.Random(seed))
+            self.inputs.append((dataPath,paramPath))
+
+    def tearDown(self):
+        shutil.rmtree(self.workDir)
+
+    # Verifies that a sequence is dropped by outputMode iff a frequent super-sequence of any longer length passes bIsSuperSeqOk
+    def checkOutputMode(self,outputMode,bIsSuperSeqOk):
+        for dataPath,paramPath in self.inputs:
+            FHistAll=MSGSPMain(self.maxK,dataPath,paramPath,OUTPUT_MODE_ALL)
+            FHistFiltered=MSGSPMain(self.maxK,dataPath,paramPath,outputMode)
+            self.assertEqual(len(FHistFiltered),len(FHistAll))
+            for k in range(len(FHistAll)):
+                filteredSeqs=[seqObj.getRawSeq() for seqObj in FHistFiltered[k]]
+                for seqObj in FHistAll[k]:
+                    bHasSuperSeq=False
+                    for FSuper in FHistAll[k+1:]:
+                        for superSeqObj in FSuper:
+                            if(rawSeqContains(superSeqObj.getRawSeq(),seqObj.getRawSeq()) and bIsSuperSeqOk(superSeqObj,seqObj)):
+                                bHasSuperSeq=True
+                                break
+                        if(bHasSuperSeq):
+                            break
+                    self.assertEqual(seqObj.getRawSeq() not in filteredSeqs,bHasSuperSeq,dataPath+": "+str(seqObj))
+
+    def test_Closed(self):
+        self.checkOutputMode(OUTPUT_MODE_CLOSED,lambda superSeqObj,seqObj: superSeqObj.getCount()==seqObj.getCount())
+
+    def test_Maximal(self):
+        self.checkOutputMode(OUTPUT_MODE_MAXIMAL,lambda superSeqObj,seqObj: True)
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.dataPath = "../../../Data/data.txt"
+        self.paramPath = "../../../Data/para.txt"
+        self.maxK=3
+
+    def test_RunJobs(self):
+        jobs=[Job(self.dataPath,self.paramPath,self.maxK,outputMode) for outputMode in (OUTPUT_MODE_ALL,OUTPUT_MODE_CLOSED,OUTPUT_MODE_MAXIMAL)]
+        jobs.append(Job(self.dataPath,"../../../Data/missing.txt",self.maxK))
+        jobs.append(Job("../../../Data/missing.txt",self.paramPath,self.maxK))
+        progress=[]
+        jobResults=runJobs(jobs,2,lambda jobResult,numJobsDone,numJobsTotal: progress.append((numJobsDone,numJobsTotal)))
+
+        self.assertEqual(sorted(progress),[(idx+1,len(jobs)) for idx in range(len(jobs))])
+        self.assertEqual([jobResult.job.outputMode for jobResult in jobResults],[job.outputMode for job in jobs])
+        for jobResult in jobResults[0:-2]:
+            self.assertTrue(jobResult.succeeded(),jobResult.error)
+            FHist=MSGSPMain(self.maxK,self.dataPath,self.paramPath,jobResult.job.outputMode)
+            self.assertEqual(str(jobResult.FHist),str(FHist))
+        # A missing parameter or data file only fails its own job
+        self.assertFalse(jobResults[-2].succeeded())
+        self.assertFalse(jobResults[-1].succeeded())
+        self.assertIn("FileNotFoundError",jobResults[-1].error)
+
+    def test_IterJobResults(self):
+        jobs=[Job(self.dataPath,self.paramPath,self.maxK,outputMode) for outputMode in (OUTPUT_MODE_ALL,OUTPUT_MODE_CLOSED,OUTPUT_MODE_MAXIMAL)]
+        # Job specs may be given as a generator
+        jobResults=list(iterJobResults((job for job in jobs),2))
+        self.assertEqual(sorted(jobResult.job.outputMode for jobResult in jobResults),sorted(job.outputMode for job in jobs))
+        self.assertTrue(all(jobResult.succeeded() for jobResult in jobResults))
+
+    def test_KilledWorker(self):
+        if(multiprocessing.get_start_method()!="fork"):
+            self.skipTest("Worker processes only see the patched MSGSPMain with the fork start method")
+        # The maximal job kills its own worker process, as the OS would when running out of memory
+        def MSGSPMainOrDie(maxK,dataPath,paramPath,outputMode,ctx):
+            if(outputMode==OUTPUT_MODE_MAXIMAL):
+                os.kill(os.getpid(),signal.SIGKILL)
+            return MSGSPMain(maxK,dataPath,paramPath,outputMode,ctx)
+        jobs=[Job(self.dataPath,self.paramPath,self.maxK,outputMode) for outputMode in (OUTPUT_MODE_ALL,OUTPUT_MODE_MAXIMAL,OUTPUT_MODE_CLOSED)]
+        with unittest.mock.patch("main.JobRunner.MSGSPMain",MSGSPMainOrDie):
+            jobResults=runJobs(jobs,2)
+        self.assertTrue(jobResults[0].succeeded(),jobResults[0].error)
+        self.assertFalse(jobResults[1].succeeded())
+        self.assertIn(str(-signal.SIGKILL),jobResults[1].error)
+        self.assertTrue(jobResults[2].succeeded(),jobResults[2].error)
+
+    def test_AppMain(self):
+        # Run the command line entry point the documented way, from a scratch directory so msgsp.log is not left behind
+        workDir=tempfile.mkdtemp()
+        try:
+            env=dict(os.environ,PYTHONPATH=os.path.abspath(".."))
+            process=subprocess.run([sys.executable,"-m","main.JobRunner",os.path.abspath(self.dataPath),os.path.abspath(self.paramPath)],
+                                   cwd=workDir,env=env,stdout=subprocess.PIPE,stderr=subprocess.PIPE,universal_newlines=True,timeout=300)
+        finally:
+            shutil.rmtree(workDir)
+        self.assertEqual(process.returncode,0,process.stderr)
+        self.assertIn("The number of length  1  sequential patterns is  44",process.stdout)
+
+class TestMSGSPDifferential(unittest.TestCase):
+    def test_AgainstReference(self):
+        reports=runDifferential([50,200,800],maxK=3)
+        for report in reports:
+            # The reference must find sequences of every length, else the comparison is vacuous
+            self.assertTrue(all(levelSize>0 for levelSize in report["refLevelSizes"]),str(report))
+            self.assertEqual((report["missing"],report["incorrect"],report["miscounted"]),(0,0,0),str(report))
+
+class TestSdcPartnerIndex(unittest.TestCase):
+    def test_MatchesPairwise(self):
+        rng=random.Random(0)
+        for sdc in (0.0,0.01,0.1,0.5,sys.float_info.max):
+            supportMap=dict((item,rng.choice((0.1,0.25,0.3,round(rng.random(),2)))) for item in range(1,40))
+            sdcPartnerIndex=SdcPartnerIndex(supportMap,sdc)
+            for item1 in supportMap:
+                partners=[item2 for item2 in supportMap if math.fabs(supportMap[item1]-supportMap[item2])<=sdc]
+                self.assertEqual(sorted(sdcPartnerIndex.getPartners(item1)),sorted(partners))
+                for item2 in supportMap:
+                    self.assertEqual(sdcPartnerIndex.isPartner(item1,item2),item2 in partners)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file